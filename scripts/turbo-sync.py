@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 """
 Turbo Game Sync - Maximum speed IGDB sync
-Requires: pip install aiohttp asyncpg python-dotenv
+Requires: pip install aiohttp asyncpg numpy ijson uvloop python-dotenv
 """
 
 import asyncio
+import uvloop
 import asyncpg
 import aiohttp
-import json
+import ijson
+import numpy as np
 import os
+import random
 from datetime import datetime
+from itertools import chain
 from dotenv import load_dotenv
 from typing import List, Dict, Any
 
@@ -33,15 +37,138 @@ if db_match:
 
 # Aggressive settings
 PARALLEL_IGDB_REQUESTS = 20  # IGDB can handle this in burst
-BATCH_SIZE = 500  # Max per IGDB request
+BATCH_SIZE = 500  # Max per IGDB query
+MULTIQUERY_SIZE = 10  # Max queries per IGDB multiquery request
+MAX_FETCH_RETRIES = 3  # Attempts per IGDB request before giving up
 DB_POOL_SIZE = 20  # Database connection pool
+DB_WRITE_CONCURRENCY = 10  # Parallel bulk UPDATEs
+WRITE_COALESCE_ROWS = 5000  # Coalesce fetch results up to this many rows
+WRITE_COALESCE_WAIT = 0.5  # ...or until this many seconds have passed
 CHUNK_SIZE = 5000  # Process 5000 games at once
 
+# Built directly from IGDB image_ids instead of rewriting the t_thumb
+# URLs the API returns, which cost two str.replace allocations per image
+IMAGE_URL_TEMPLATE = 'https://images.igdb.com/igdb/image/upload/t_1080p/{}.jpg'
+
+# Array-valued columns travel as a single joined TEXT per row (unnest
+# can't emit array-typed columns) and are split server-side with
+# string_to_array; the unit separator can't appear in names or URLs
+ARRAY_SEP = '\x1f'
+
+# Fixed parts of every IGDB request, built once instead of per call:
+# only the query name ({0}) and the id list ({1}) vary per batch
+IGDB_QUERY_TEMPLATE = (
+    'query games "b{0}" {{'
+    ' fields summary,cover.image_id,first_release_date,'
+    'platforms.name,involved_companies.company.name,'
+    'involved_companies.developer,involved_companies.publisher,'
+    'screenshots.image_id,aggregated_rating,total_rating,'
+    'total_rating_count,franchises.name,collections.name,'
+    'alternative_names.name,category,parent_game;'
+    ' where id = ({1});'
+    f' limit {BATCH_SIZE};'
+    ' }};'
+)
+
+IGDB_HEADERS = {
+    'Client-ID': IGDB_CLIENT_ID,
+    'Authorization': f'Bearer {IGDB_TOKEN}',
+    # Ask IGDB explicitly to compress; these text-heavy payloads
+    # shrink 5-10x and aiohttp auto-decompresses before ijson. gzip
+    # only: aiohttp can't decode brotli without the optional Brotli
+    # package, so advertising br would break every compressed response
+    'Accept-Encoding': 'gzip'
+}
+
+# "Needs sync" predicate, matched exactly by the game_needs_sync_idx
+# partial index (supabase/migrations/20260829_add_game_needs_sync_index.sql)
+NEEDS_SYNC_WHERE = """
+    igdb_id IS NOT NULL
+    AND (
+        cover_url IS NULL OR
+        summary IS NULL OR
+        developer IS NULL OR
+        release_date IS NULL OR
+        last_synced IS NULL
+    )
+"""
+
+NEEDS_SYNC_SQL = f"""
+    SELECT igdb_id
+    FROM game
+    WHERE {NEEDS_SYNC_WHERE}
+    ORDER BY rating_count DESC NULLS LAST
+"""
+
+
+# Single unnest-based UPDATE: the column arrays arrive as one binary
+# asyncpg message and are joined row-wise server-side, so there is no
+# staging table, no COPY and no JSONB document to parse per game. Kept
+# as a module constant and run via fetchval so asyncpg prepares it once
+# per connection and reuses the cached plan.
+UPDATE_FROM_UNNEST_SQL = """
+    WITH updated AS (
+        UPDATE game g
+        SET
+            summary = COALESCE(g.summary, t.summary),
+            cover_url = COALESCE(g.cover_url, t.cover_url),
+            release_date = COALESCE(g.release_date, t.release_date),
+            developer = COALESCE(g.developer, t.developer),
+            publisher = COALESCE(g.publisher, t.publisher),
+            platforms = COALESCE(
+                CASE WHEN array_length(g.platforms, 1) > 0 THEN g.platforms ELSE NULL END,
+                string_to_array(t.platforms, E'\\x1f')
+            ),
+            screenshots = COALESCE(
+                CASE WHEN array_length(g.screenshots, 1) > 0 THEN g.screenshots ELSE NULL END,
+                string_to_array(t.screenshots, E'\\x1f')
+            ),
+            total_rating = COALESCE(g.total_rating, t.total_rating),
+            rating_count = GREATEST(g.rating_count, COALESCE(t.rating_count, 0)),
+            metacritic_score = t.metacritic_score,
+            franchise_name = COALESCE(g.franchise_name, t.franchise_name),
+            collection_name = COALESCE(g.collection_name, t.collection_name),
+            alternative_names = string_to_array(t.alternative_names, E'\\x1f'),
+            category = COALESCE(g.category, t.category),
+            parent_game = COALESCE(g.parent_game, t.parent_game),
+            last_synced = NOW(),
+            data_source = 'turbo_sync'
+        FROM unnest(
+            $1::INTEGER[], $2::TEXT[], $3::TEXT[], $4::DATE[],
+            $5::TEXT[], $6::TEXT[], $7::TEXT[], $8::TEXT[],
+            $9::INTEGER[], $10::INTEGER[], $11::INTEGER[],
+            $12::TEXT[], $13::TEXT[], $14::TEXT[],
+            $15::INTEGER[], $16::INTEGER[]
+        ) AS t(
+            igdb_id, summary, cover_url, release_date,
+            developer, publisher, platforms, screenshots,
+            total_rating, rating_count, metacritic_score,
+            franchise_name, collection_name, alternative_names,
+            category, parent_game
+        )
+        WHERE g.igdb_id = t.igdb_id
+        RETURNING 1
+    )
+    SELECT count(*) FROM updated
+"""
+
+
+class IGDBError(Exception):
+    """Non-200 response from IGDB"""
+
+    def __init__(self, status: int, retry_after: float = None):
+        super().__init__(f"IGDB error: {status}")
+        self.status = status
+        self.retry_after = retry_after
+
 
 class TurboGameSync:
     def __init__(self):
+        self.failures = []  # id batch groups that exhausted their retries
         self.session = None
         self.db_pool = None
+        self.work_q = None
+        self.out_q = None
         self.stats = {
             'total': 0,
             'processed': 0,
@@ -52,7 +179,19 @@ class TurboGameSync:
 
     async def init(self):
         """Initialize connections"""
-        self.session = aiohttp.ClientSession()
+        # Cap the connector at exactly the fetch parallelism and keep
+        # connections alive between requests so the 20-way burst to
+        # api.igdb.com reuses warm TLS sessions instead of re-handshaking
+        connector = aiohttp.TCPConnector(
+            limit=PARALLEL_IGDB_REQUESTS,
+            limit_per_host=PARALLEL_IGDB_REQUESTS,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
         self.db_pool = await asyncpg.create_pool(
             host=DB_HOST,
             port=DB_PORT,
@@ -61,212 +200,298 @@ class TurboGameSync:
             database=DB_NAME,
             min_size=10,
             max_size=DB_POOL_SIZE,
-            command_timeout=60
+            command_timeout=60,
+            setup=self._prepare_conn
         )
+        # Fetch->load pipeline queues, both bounded for backpressure:
+        # the cursor producer blocks instead of buffering every candidate
+        # id batch, and fetchers block instead of piling results up
+        # faster than the DB writers can drain them
+        self.work_q = asyncio.Queue(maxsize=PARALLEL_IGDB_REQUESTS * 2)
+        self.out_q = asyncio.Queue(maxsize=4)
+
+    async def _prepare_conn(self, conn):
+        """Per-connection pool setup"""
+        # Bulk-load session tuning: the sync is idempotent and
+        # re-runnable, so the tiny crash window from async commits is an
+        # acceptable trade for much lower commit latency. work_mem covers
+        # the per-row array unpacking in the UPDATE, and eager JIT pays
+        # off because the same prepared plan runs hundreds of times.
+        await conn.execute("""
+            SET synchronous_commit = off;
+            SET work_mem = '64MB';
+            SET jit = on;
+            SET jit_above_cost = 0;
+        """)
 
     async def close(self):
         """Cleanup connections"""
         await self.session.close()
         await self.db_pool.close()
 
-    async def fetch_igdb_batch(self, igdb_ids: List[int]) -> List[Dict]:
-        """Fetch batch from IGDB"""
-        query = f"""
-        fields name,summary,cover.url,first_release_date,
-               platforms.name,involved_companies.company.name,
-               involved_companies.developer,involved_companies.publisher,
-               screenshots.url,aggregated_rating,total_rating,
-               total_rating_count,franchises.name,collections.name,
-               alternative_names.name,similar_games,dlcs,expansions,
-               category,parent_game;
-        where id = ({','.join(map(str, igdb_ids))});
-        limit {BATCH_SIZE};
-        """
+    async def fetch_igdb_multiquery(self, batches: List[List[int]]):
+        """Fetch up to MULTIQUERY_SIZE id batches in one IGDB request.
 
-        headers = {
-            'Client-ID': IGDB_CLIENT_ID,
-            'Authorization': f'Bearer {IGDB_TOKEN}'
-        }
+        Bundles the batches as named queries against /v4/multiquery,
+        cutting HTTP round-trips 10x versus one POST per batch. Yields
+        one raw game dict at a time via ijson instead of buffering the
+        whole response, so peak memory per fetch stays flat even with
+        PARALLEL_IGDB_REQUESTS in flight.
+        """
+        body = '\n'.join(
+            IGDB_QUERY_TEMPLATE.format(i, ','.join(map(str, igdb_ids)))
+            for i, igdb_ids in enumerate(batches)
+        )
 
         async with self.session.post(
-            'https://api.igdb.com/v4/games',
-            headers=headers,
-            data=query
+            'https://api.igdb.com/v4/multiquery',
+            headers=IGDB_HEADERS,
+            data=body
         ) as response:
             if response.status == 200:
-                return await response.json()
+                # Response is [{"name": "b0", "result": [games...]}, ...];
+                # stream every game across the named sub-results
+                async for game in ijson.items(response.content,
+                                              'item.result.item',
+                                              use_float=True):
+                    yield game
             else:
-                print(f"IGDB error: {response.status}")
-                return []
-
-    def transform_game(self, igdb_data: Dict) -> Dict:
-        """Transform IGDB data to our schema"""
-        transformed = {
-            'igdb_id': igdb_data['id'],
-            'summary': igdb_data.get('summary'),
-            'release_date': datetime.fromtimestamp(
-                igdb_data['first_release_date']
-            ).date() if igdb_data.get('first_release_date') else None,
-            'cover_url': igdb_data.get('cover', {}).get('url', '').replace(
-                '//images.igdb.com', 'https://images.igdb.com'
-            ).replace('t_thumb', 't_1080p') or None,
-            'platforms': [p['name'] for p in igdb_data.get('platforms', [])],
-            'screenshots': [
-                s['url'].replace('//images.igdb.com', 'https://images.igdb.com')
-                .replace('t_thumb', 't_1080p')
-                for s in igdb_data.get('screenshots', [])
-            ],
-            'total_rating': round(igdb_data.get('total_rating', 0)),
-            'rating_count': igdb_data.get('total_rating_count', 0),
-            'metacritic_score': round(igdb_data.get('aggregated_rating', 0)),
-            'franchise_name': igdb_data.get('franchises', [{}])[0].get('name'),
-            'collection_name': igdb_data.get('collections', [{}])[0].get('name'),
-            'alternative_names': [a['name'] for a in igdb_data.get('alternative_names', [])],
-            'similar_game_ids': igdb_data.get('similar_games', []),
-            'dlc_ids': igdb_data.get('dlcs', []),
-            'expansion_ids': igdb_data.get('expansions', []),
-            'category': igdb_data.get('category'),
-            'parent_game': igdb_data.get('parent_game')
-        }
+                retry_after = response.headers.get('Retry-After')
+                raise IGDBError(
+                    response.status,
+                    float(retry_after) if retry_after else None
+                )
+
+    def transform_game(self, igdb_data: Dict) -> tuple:
+        """Flatten one raw IGDB game into a column tuple for the UPDATE.
 
-        # Extract developer/publisher
-        companies = igdb_data.get('involved_companies', [])
-        for company in companies:
+        Tuple order matches the unnest() column list in
+        UPDATE_FROM_UNNEST_SQL.
+        """
+        developer = None
+        publisher = None
+        for company in igdb_data.get('involved_companies', []):
             if company.get('developer'):
-                transformed['developer'] = company.get('company', {}).get('name')
+                developer = company.get('company', {}).get('name')
             if company.get('publisher'):
-                transformed['publisher'] = company.get('company', {}).get('name')
-
-        return transformed
+                publisher = company.get('company', {}).get('name')
+
+        cover_id = igdb_data.get('cover', {}).get('image_id')
+
+        return (
+            igdb_data['id'],
+            igdb_data.get('summary'),
+            IMAGE_URL_TEMPLATE.format(cover_id) if cover_id else None,
+            # Raw epoch seconds and ratings; converted to date / rounded
+            # in one vectorized pass per batch in bulk_update_database
+            igdb_data.get('first_release_date'),
+            developer,
+            publisher,
+            ARRAY_SEP.join(p['name'] for p in igdb_data.get('platforms', [])),
+            ARRAY_SEP.join(
+                IMAGE_URL_TEMPLATE.format(s['image_id'])
+                for s in igdb_data.get('screenshots', [])
+                if s.get('image_id')
+            ),
+            igdb_data.get('total_rating', 0),
+            igdb_data.get('total_rating_count', 0),
+            igdb_data.get('aggregated_rating', 0),
+            (igdb_data.get('franchises') or [{}])[0].get('name'),
+            (igdb_data.get('collections') or [{}])[0].get('name'),
+            ARRAY_SEP.join(a['name'] for a in igdb_data.get('alternative_names', [])),
+            igdb_data.get('category'),
+            igdb_data.get('parent_game')
+        )
 
-    async def bulk_update_database(self, games: List[Dict]):
-        """Ultra-fast bulk database update using COPY"""
+    async def bulk_update_database(self, rows: List[tuple]):
+        """Ultra-fast bulk update via a single unnest-based UPDATE"""
+        # Pivot row tuples into the column-parallel arrays the prepared
+        # statement expects; asyncpg ships them as one binary message
+        columns = list(zip(*rows))
+
+        # Vectorize the epoch->date and rating rounding across the whole
+        # batch (~20ns/elem) instead of datetime.fromtimestamp and
+        # round() per row (~1us each)
+        release_ts = columns[3]
+        dates = np.array(
+            [ts or 0 for ts in release_ts], dtype='int64'
+        ).astype('datetime64[s]').astype('datetime64[D]').tolist()
+        columns[3] = [d if ts else None for d, ts in zip(dates, release_ts)]
+        columns[8] = np.rint(np.asarray(columns[8], dtype='float64')).astype('int64').tolist()
+        columns[10] = np.rint(np.asarray(columns[10], dtype='float64')).astype('int64').tolist()
         async with self.db_pool.acquire() as conn:
-            # Create temp table
-            await conn.execute("""
-                CREATE TEMP TABLE temp_game_updates (
-                    igdb_id INTEGER,
-                    data JSONB
-                )
-            """)
-
-            # Bulk insert using COPY
-            records = [(g['igdb_id'], json.dumps(g)) for g in games]
-            await conn.copy_records_to_table(
-                'temp_game_updates',
-                records=records,
-                columns=['igdb_id', 'data']
-            )
-
-            # Single UPDATE from temp table
-            result = await conn.execute("""
-                UPDATE game g
-                SET
-                    summary = COALESCE(g.summary, (t.data->>'summary')::TEXT),
-                    cover_url = COALESCE(g.cover_url, (t.data->>'cover_url')::TEXT),
-                    release_date = COALESCE(g.release_date, (t.data->>'release_date')::DATE),
-                    developer = COALESCE(g.developer, (t.data->>'developer')::TEXT),
-                    publisher = COALESCE(g.publisher, (t.data->>'publisher')::TEXT),
-                    platforms = COALESCE(
-                        CASE WHEN array_length(g.platforms, 1) > 0 THEN g.platforms ELSE NULL END,
-                        ARRAY(SELECT jsonb_array_elements_text(t.data->'platforms'))
-                    ),
-                    screenshots = COALESCE(
-                        CASE WHEN array_length(g.screenshots, 1) > 0 THEN g.screenshots ELSE NULL END,
-                        ARRAY(SELECT jsonb_array_elements_text(t.data->'screenshots'))
-                    ),
-                    total_rating = COALESCE(g.total_rating, (t.data->>'total_rating')::INTEGER),
-                    rating_count = GREATEST(g.rating_count, COALESCE((t.data->>'rating_count')::INTEGER, 0)),
-                    metacritic_score = (t.data->>'metacritic_score')::INTEGER,
-                    franchise_name = COALESCE(g.franchise_name, (t.data->>'franchise_name')::TEXT),
-                    collection_name = COALESCE(g.collection_name, (t.data->>'collection_name')::TEXT),
-                    alternative_names = ARRAY(SELECT jsonb_array_elements_text(t.data->'alternative_names')),
-                    category = COALESCE(g.category, (t.data->>'category')::INTEGER),
-                    parent_game = COALESCE(g.parent_game, (t.data->>'parent_game')::INTEGER),
-                    last_synced = NOW(),
-                    data_source = 'turbo_sync'
-                FROM temp_game_updates t
-                WHERE g.igdb_id = t.igdb_id
-            """)
-
-            # Get update count
-            updated = int(result.split()[-1])
+            updated = await conn.fetchval(UPDATE_FROM_UNNEST_SQL, *columns)
             self.stats['updated'] += updated
 
-            # Drop temp table
-            await conn.execute("DROP TABLE temp_game_updates")
+    async def collect_batches(self, batches: List[List[int]]) -> List[tuple]:
+        """Stream one IGDB multiquery into a list of column tuples.
 
-    async def process_chunk(self, games: List[Dict]):
-        """Process a chunk of games"""
-        igdb_ids = [g['igdb_id'] for g in games if g['igdb_id']]
-        if not igdb_ids:
-            return
-
-        # Split into IGDB request batches
-        batches = [igdb_ids[i:i+BATCH_SIZE] for i in range(0, len(igdb_ids), BATCH_SIZE)]
-
-        # Fetch all batches in parallel
-        tasks = [self.fetch_igdb_batch(batch) for batch in batches]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Flatten and transform results
-        all_games = []
-        for result in results:
-            if isinstance(result, list):
-                all_games.extend([self.transform_game(g) for g in result])
-
-        if all_games:
-            await self.bulk_update_database(all_games)
+        Retries rate limits (429, honoring Retry-After), server errors
+        and transport errors with exponential backoff plus jitter; only
+        this task sleeps, the rest of the worker pool keeps going. Batch
+        groups that exhaust their retries are recorded in self.failures
+        instead of silently dropping a chunk of work.
+        """
+        delay = 1.0
+        for attempt in range(MAX_FETCH_RETRIES):
+            try:
+                return [self.transform_game(g)
+                        async for g in self.fetch_igdb_multiquery(batches)]
+            except IGDBError as e:
+                if e.status == 429:
+                    wait = e.retry_after or delay
+                elif e.status >= 500:
+                    wait = delay
+                else:
+                    # 4xx like expired auth - retrying won't help
+                    print(f"IGDB error {e.status}, not retrying")
+                    break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # ClientTimeout raises asyncio.TimeoutError, which is not
+                # a ClientError - it must be retried here too instead of
+                # aborting the whole TaskGroup
+                print(f"IGDB transport error: {e!r}")
+                wait = delay
+            if attempt == MAX_FETCH_RETRIES - 1:
+                break  # out of attempts - nothing to sleep for
+            await asyncio.sleep(wait + random.uniform(0, 0.5))
+            delay *= 2
+
+        self.stats['failed'] += sum(len(b) for b in batches)
+        self.failures.append(batches)
+        return []
+
+    async def fetch_worker(self):
+        """Producer: pull id batches off work_q, fetch, push column tuples"""
+        while True:
+            batches = await self.work_q.get()
+            if batches is None:
+                return
+            rows = await self.collect_batches(batches)
+            self.stats['processed'] += sum(len(b) for b in batches)
+            if rows:
+                await self.out_q.put(rows)
+
+    async def db_worker(self):
+        """Consumer: coalesce fetched rows and run the bulk UPDATE.
+
+        Each fetch result is ~5000 rows at best but can be much smaller;
+        firing an UPDATE per result means more row locking and WAL
+        flushes than necessary. After the first result arrives, keep
+        draining until WRITE_COALESCE_ROWS rows are pending or
+        WRITE_COALESCE_WAIT elapses, then update once.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            rows = await self.out_q.get()
+            if rows is None:
+                return
+
+            # Collect result lists as-is and flatten once at flush time;
+            # extending a growing batch list would recopy rows per drain
+            pending = [rows]
+            pending_rows = len(rows)
+            stopping = False
+            deadline = loop.time() + WRITE_COALESCE_WAIT
+            while pending_rows < WRITE_COALESCE_ROWS:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    more = await asyncio.wait_for(self.out_q.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if more is None:
+                    # Treat a sentinel seen mid-drain as our own stop
+                    # signal: flush what we have and exit. run() enqueues
+                    # exactly one sentinel per writer, so putting it back
+                    # would let one sentinel retire several writers and
+                    # leave run() blocked putting the rest into a full
+                    # queue with no consumers left.
+                    stopping = True
+                    break
+                pending.append(more)
+                pending_rows += len(more)
+
+            await self.bulk_update_database(list(chain.from_iterable(pending)))
+            if stopping:
+                return
+
+    async def queue_work(self):
+        """Stream sync candidates off a server-side cursor onto work_q.
+
+        Iterating a cursor inside a transaction keeps peak memory at
+        O(CHUNK_SIZE) instead of fetching every candidate row up-front,
+        and lets Postgres serve the scan from game_needs_sync_idx.
+        """
+        batch = []
+        group = []
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                async for row in conn.cursor(NEEDS_SYNC_SQL,
+                                             prefetch=CHUNK_SIZE):
+                    batch.append(row['igdb_id'])
+                    if len(batch) >= BATCH_SIZE:
+                        group.append(batch)
+                        batch = []
+                        if len(group) >= MULTIQUERY_SIZE:
+                            await self.work_q.put(group)
+                            group = []
+        if batch:
+            group.append(batch)
+        if group:
+            await self.work_q.put(group)
+        for _ in range(PARALLEL_IGDB_REQUESTS):
+            await self.work_q.put(None)  # one stop sentinel per fetcher
+
+    async def report_progress(self, interval: float = 5.0):
+        """Print sync progress until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            elapsed = (datetime.now() - self.stats['start_time']).total_seconds()
+            rate = self.stats['processed'] / elapsed if elapsed > 0 else 0
+            pct = (self.stats['processed'] / self.stats['total'] * 100) if self.stats['total'] > 0 else 0
 
-        self.stats['processed'] += len(games)
+            print(f"Progress: {self.stats['processed']}/{self.stats['total']} "
+                  f"({pct:.1f}%) | Rate: {rate:.0f}/sec | "
+                  f"Updated: {self.stats['updated']}")
 
     async def run(self):
         """Main sync process"""
         print("🚀 TURBO SYNC INITIATED")
 
-        # Get all games needing sync
+        # Count candidates cheaply (index-only on game_needs_sync_idx);
+        # the rows themselves are streamed by queue_work, not fetched here
         async with self.db_pool.acquire() as conn:
-            games = await conn.fetch("""
-                SELECT id, game_id, igdb_id, name
-                FROM game
-                WHERE igdb_id IS NOT NULL
-                AND (
-                    cover_url IS NULL OR
-                    summary IS NULL OR
-                    developer IS NULL OR
-                    release_date IS NULL OR
-                    last_synced IS NULL
-                )
-                ORDER BY rating_count DESC NULLS LAST
-            """)
-
-        self.stats['total'] = len(games)
+            self.stats['total'] = await conn.fetchval(
+                f"SELECT count(*) FROM game WHERE {NEEDS_SYNC_WHERE}"
+            )
         print(f"Found {self.stats['total']} games to sync")
 
-        # Process in chunks
-        chunks = [games[i:i+CHUNK_SIZE] for i in range(0, len(games), CHUNK_SIZE)]
-
-        for i, chunk in enumerate(chunks):
-            # Process chunk with max parallelism
-            sub_chunks = [chunk[j:j+BATCH_SIZE] for j in range(0, len(chunk), BATCH_SIZE)]
-            tasks = [self.process_chunk(sc) for sc in sub_chunks[:PARALLEL_IGDB_REQUESTS]]
-
-            await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Progress update
-            elapsed = (datetime.now() - self.stats['start_time']).total_seconds()
-            rate = self.stats['processed'] / elapsed if elapsed > 0 else 0
-            pct = (self.stats['processed'] / self.stats['total'] * 100) if self.stats['total'] > 0 else 0
-
-            print(f"Progress: {self.stats['processed']}/{self.stats['total']} "
-                  f"({pct:.1f}%) | Rate: {rate:.0f}/sec | "
-                  f"Updated: {self.stats['updated']}")
+        reporter = asyncio.create_task(self.report_progress())
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self.queue_work())
+                fetchers = [tg.create_task(self.fetch_worker())
+                            for _ in range(PARALLEL_IGDB_REQUESTS)]
+                writers = [tg.create_task(self.db_worker())
+                           for _ in range(DB_WRITE_CONCURRENCY)]
+
+                # Once all fetchers drain the work queue, tell the writers
+                await asyncio.gather(*fetchers)
+                for _ in writers:
+                    await self.out_q.put(None)
+        finally:
+            reporter.cancel()
 
         # Final stats
         elapsed = (datetime.now() - self.stats['start_time']).total_seconds()
         print(f"\n✅ SYNC COMPLETE in {elapsed:.0f} seconds")
         print(f"Updated: {self.stats['updated']} games")
         print(f"Rate: {self.stats['total']/elapsed:.0f} games/second")
+        if self.failures:
+            print(f"⚠️  Gave up on {self.stats['failed']} games across "
+                  f"{len(self.failures)} requests - re-run to retry them")
 
 
 async def main():
@@ -279,4 +504,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    uvloop.install()
     asyncio.run(main())
\ No newline at end of file
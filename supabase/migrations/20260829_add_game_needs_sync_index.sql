@@ -0,0 +1,28 @@
+-- Migration: Add partial index for turbo-sync candidate scan
+-- Date: 2026-08-29
+-- Purpose: scripts/turbo-sync.py selects games missing cover/summary/
+--          developer/release_date/last_synced ordered by rating_count.
+--          Without an index this is a full seq scan of the game table on
+--          every sync run; this partial index covers exactly that
+--          predicate so the scan becomes an index(-only) scan.
+
+-- NOTE: if running this by hand on production, prefer
+--   CREATE INDEX CONCURRENTLY ...
+-- outside a transaction to avoid blocking writes on game.
+CREATE INDEX IF NOT EXISTS game_needs_sync_idx
+  ON game (rating_count DESC NULLS LAST)
+  INCLUDE (igdb_id)
+  WHERE igdb_id IS NOT NULL
+    AND (
+      cover_url IS NULL OR
+      summary IS NULL OR
+      developer IS NULL OR
+      release_date IS NULL OR
+      last_synced IS NULL
+    );
+
+-- Log migration
+DO $$
+BEGIN
+  RAISE NOTICE 'Migration completed: Added game_needs_sync_idx partial index';
+END $$;